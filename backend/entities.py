@@ -0,0 +1,270 @@
+"""
+GlobalLens A1 - Ticker & Entity Extraction
+Links news articles to the assets tracked in market_data.py using an
+Aho-Corasick automaton over tickers, company names and coin names.
+"""
+import os
+import string
+import sys
+import time
+from datetime import datetime
+
+from market_data import CRYPTO_IDS, CRYPTO_SYMBOLS, STOCK_NAMES, STOCK_SYMBOLS
+from storage import atomic_write_json, file_lock, read_json
+
+# Fix Windows console encoding for emojis
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "data")
+NEWS_FILE = os.path.join(DATA_DIR, "news.json")
+INDEX_FILE = os.path.join(DATA_DIR, "symbol_index.json")  # symbol -> article IDs
+
+# ASCII-only lowercasing keeps string offsets identical to the original text
+_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def default_patterns():
+    """Build (pattern, symbol, case_sensitive) triples from market_data config.
+
+    Tickers and company names are matched case-sensitively so "SOL" does not
+    fire on "sol" nor "Apple" on "apple pie"; coin IDs ("bitcoin") are matched
+    case-insensitively.
+    """
+    patterns = []
+    for symbol in STOCK_SYMBOLS:
+        patterns.append((symbol, symbol, True))
+        for name in STOCK_NAMES.get(symbol, []):
+            patterns.append((name, symbol, True))
+    for coin_id in CRYPTO_IDS:
+        symbol = CRYPTO_SYMBOLS.get(coin_id, coin_id.upper())
+        patterns.append((symbol, symbol, True))
+        patterns.append((coin_id, symbol, False))
+    return patterns
+
+
+class EntityExtractor:
+    def __init__(self, patterns=None):
+        """
+        Compile the Aho-Corasick automaton once; `extract` is then a single
+        pass over the text regardless of how many patterns are tracked.
+        """
+        self.patterns = patterns if patterns is not None else default_patterns()
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for idx, (pattern, _, _) in enumerate(self.patterns):
+            self._add(pattern.translate(_LOWER), idx)
+        self._build_failure_links()
+
+    def _add(self, word, idx):
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def extract(self, text):
+        """Return the sorted list of symbols mentioned in `text`."""
+        if not text:
+            return []
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        lowered = text.translate(_LOWER)
+        n = len(text)
+        found = set()
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for idx in out[state]:
+                pattern, symbol, case_sensitive = patterns[idx]
+                start = i - len(pattern) + 1
+                # Whole-word matches only ("Apple" but not "Pineapple")
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if i + 1 < n and text[i + 1].isalnum():
+                    continue
+                if case_sensitive and text[start:i + 1] != pattern:
+                    continue
+                found.add(symbol)
+        return sorted(found)
+
+    def extract_article(self, article):
+        """Extract symbols from an article's title, summary and content."""
+        text = "\n".join(
+            article.get(field) or "" for field in ("title", "summary", "content")
+        )
+        return self.extract(text)
+
+
+def article_symbols(article, extractor, reextract=False):
+    """Return the symbols an article mentions, tagging it if needed.
+
+    Articles tagged at ingest keep their stored `symbols` unless `reextract`
+    is set, which re-runs extraction and overwrites them (e.g. after a ticker
+    or name is added to market_data.py).
+    """
+    if reextract or article.get("symbols") is None:
+        article["symbols"] = extractor.extract_article(article)
+    return article["symbols"]
+
+
+def build_symbol_index(articles, extractor=None, reextract=False):
+    """Map symbol -> article IDs, preserving article order (newest first).
+
+    Untagged articles are tagged in place, so saving `articles` afterwards
+    persists their symbols.
+    """
+    extractor = extractor or EntityExtractor()
+    index = {}
+    for article in articles:
+        for symbol in article_symbols(article, extractor, reextract):
+            index.setdefault(symbol, []).append(article.get("id"))
+    return index
+
+
+def save_symbol_index(index, lock=True):
+    """Atomically write the symbol index next to news.json."""
+    data = {
+        "updated_at": datetime.utcnow().isoformat() + "Z",
+        "symbols": index
+    }
+    atomic_write_json(INDEX_FILE, data, lock=lock)
+
+
+def load_symbol_index():
+    """Load the symbol index from disk, or None if it is missing/unreadable."""
+    try:
+        data = read_json(INDEX_FILE)
+    except ValueError:
+        return None
+    return data.get("symbols", {}) if data is not None else None
+
+
+def benchmark(min_bytes=8 * 1024 * 1024):
+    """Measure extraction throughput in MB/s of article text."""
+    extractor = EntityExtractor()
+
+    texts = []
+    for article in read_json(NEWS_FILE, default=[]):
+        texts.append("\n".join(
+            article.get(field) or "" for field in ("title", "summary", "content")
+        ))
+    if not texts:
+        texts = [
+            "Nvidia shares rallied while Tesla slipped; bitcoin and ETH traded "
+            "sideways as investors weighed Microsoft earnings and AAPL guidance. "
+            "Pasar saham Asia dibuka menguat didorong sentimen suku bunga global. "
+        ] * 50
+
+    sample = "\n".join(texts)
+    sample_bytes = len(sample.encode("utf-8"))
+    rounds = max(1, min_bytes // max(sample_bytes, 1))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            extractor.extract(text)
+    elapsed = time.perf_counter() - start
+
+    total_mb = sample_bytes * rounds / (1024 * 1024)
+    mb_per_s = total_mb / elapsed if elapsed > 0 else float("inf")
+    print(f"⚡ Extracted {total_mb:.1f} MB in {elapsed:.2f}s → {mb_per_s:.2f} MB/s "
+          f"({len(extractor.patterns)} patterns, {len(texts)} texts)")
+    return mb_per_s
+
+
+def self_check():
+    """Verify extraction results on known inputs."""
+    extractor = EntityExtractor()
+    cases = [
+        # Name -> ticker mapping
+        ("Nvidia and Microsoft rallied", ["MSFT", "NVDA"]),
+        ("Tesla, Apple, bitcoin, Ethereum and Solana", ["AAPL", "BTC", "ETH", "SOL", "TSLA"]),
+        # Word boundaries
+        ("Pineapple futures", []),
+        ("ETHICS board", []),
+        ("TSLA2 warrants", []),
+        ("(AAPL) and NVDA.", ["AAPL", "NVDA"]),
+        # Ticker and company-name case; coin IDs are case-insensitive
+        ("sol y sombra", []),
+        ("SOL breaks out", ["SOL"]),
+        ("apple pie recipe", []),
+        ("BITCOIN hits record", ["BTC"]),
+    ]
+
+    # Overlapping patterns: a match that is a suffix of a longer partial match
+    # is only found through the Aho-Corasick failure links.
+    overlap = EntityExtractor([
+        ("he", "HE", False), ("she", "SHE", False), ("hers", "HERS", False),
+        ("his", "HIS", False), ("Bank of Amex", "AMEX", True),
+        ("of America", "BOFA", True), ("Apple Music", "MUSIC", True),
+        ("Apple", "AAPL", True),
+    ])
+    overlap_cases = [
+        ("she said hers and his; he left", ["HE", "HERS", "HIS", "SHE"]),
+        ("ushers", []),
+        ("Bank of America", ["BOFA"]),
+        ("Apple Music subscribers", ["AAPL", "MUSIC"]),
+    ]
+
+    failures = []
+    for ex, group in ((extractor, cases), (overlap, overlap_cases)):
+        for text, expected in group:
+            got = ex.extract(text)
+            if got != expected:
+                failures.append(f"{text!r}: expected {expected}, got {got}")
+
+    if failures:
+        print(f"❌ Self-check failed ({len(failures)} errors), first: {failures[0]}")
+        return False
+    print(f"✅ Self-check passed: {len(cases) + len(overlap_cases)} cases")
+    return True
+
+
+def main():
+    print("🔎 Re-extracting symbols for all articles in news.json...")
+    with file_lock(NEWS_FILE):
+        articles = read_json(NEWS_FILE, default=[], lock=False)
+        index = build_symbol_index(articles, reextract=True)
+        atomic_write_json(NEWS_FILE, articles, lock=False)
+        save_symbol_index(index)
+
+    for symbol, ids in sorted(index.items()):
+        print(f"   {symbol}: {len(ids)} articles")
+    print(f"✅ Re-tagged {len(articles)} articles and saved {INDEX_FILE}")
+    return index
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    elif "--check" in sys.argv:
+        sys.exit(0 if self_check() else 1)
+    else:
+        main()
@@ -1,8 +1,9 @@
-import json
 import os
 import sys
 from scraper import NewsScraper
 from ai_processor import AIProcessor
+from entities import EntityExtractor, build_symbol_index, save_symbol_index
+from storage import Journal, atomic_write_json, file_lock, read_json, remove_stale_temp_files
 import logging
 import time
 from datetime import datetime, timedelta
@@ -17,19 +18,42 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 DATA_FILE = os.path.join(DATA_DIR, "news.json")
+JOURNAL_FILE = os.path.join(DATA_DIR, "news.journal")  # Pending article commits
 
 # Data retention period (14 days)
 RETENTION_DAYS = 14
 
-def load_existing_articles():
-    """Load existing articles from disk."""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+def load_existing_articles(lock=True):
+    """Load existing articles from disk.
+
+    Raises ValueError if news.json exists but is unreadable, so a damaged
+    file is never mistaken for an empty corpus and overwritten.
+    """
+    return read_json(DATA_FILE, default=[], lock=lock)
+
+def save_articles(new_articles, journal, extractor=None):
+    """Merge `new_articles` into news.json and clear them from the journal.
+
+    news.json is re-read under the lock so articles saved by a concurrent
+    run of main.py are kept. The symbol index is rewritten alongside it.
+    Returns (all_articles, added_articles).
+    """
+    with file_lock(DATA_FILE):
+        current = cleanup_old_articles(load_existing_articles(lock=False))
+        current_urls = {a.get("original_url") for a in current}
+        added = [a for a in new_articles if a.get("original_url") not in current_urls]
+
+        # Merge new with existing (new first for recency)
+        all_articles = added + current
+
+        # Tags untagged (pre-index) articles in place before they are saved
+        index = build_symbol_index(all_articles, extractor)
+        atomic_write_json(DATA_FILE, all_articles, lock=False)
+        save_symbol_index(index)
+
+    saved_urls = {a.get("original_url") for a in all_articles}
+    journal.compact(lambda record: record.get("original_url") not in saved_urls)
+    return all_articles, added
 
 def cleanup_old_articles(articles, days=RETENTION_DAYS):
     """Remove articles older than `days` days."""
@@ -75,16 +99,29 @@ def cleanup_old_articles(articles, days=RETENTION_DAYS):
 def main():
     scraper = NewsScraper()
     ai = AIProcessor(model="llama3.1") # User can change model here
+    extractor = EntityExtractor()
+    journal = Journal(JOURNAL_FILE)
+    remove_stale_temp_files(DATA_DIR)  # Left behind if a previous run was killed mid-write
 
     print("="*60)
     print("  📈 GlobalLens A1 - Market Intelligence Generator")
     print("="*60)
 
-    # Load existing articles and cleanup old ones
-    existing = load_existing_articles()
-    existing = cleanup_old_articles(existing)
+    # Load existing articles
+    try:
+        existing = load_existing_articles()
+    except ValueError as e:
+        print(f"❌ {DATA_FILE} is unreadable ({e}). Aborting so it is not overwritten.",
+              file=sys.stderr)
+        sys.exit(1)
     existing_urls = {a.get("original_url") for a in existing}
 
+    # Recover articles analysed by a previous run that crashed before saving
+    processed_news = [a for a in journal.replay() if a.get("original_url") not in existing_urls]
+    if processed_news:
+        print(f"♻️  Recovered {len(processed_news)} pending articles from journal")
+    existing_urls |= {a.get("original_url") for a in processed_news}
+
     print(f"\n--- 1. Scraping Financial Sources (Finance, Crypto, Geopolitics) ---")
     raw_articles = scraper.get_latest_articles(limit_per_feed=2)
     print(f"--- Scraped {len(raw_articles)} articles ---")
@@ -95,13 +132,10 @@ def main():
 
     if not new_articles:
         print("✅ No new articles. Database is up to date.")
-        # Still save cleaned data
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(existing, f, indent=2, ensure_ascii=False)
+        # Still save cleaned data (and anything recovered from the journal)
+        save_articles(processed_news, journal, extractor)
         return
 
-    processed_news = []
-
     print(f"\n--- 2. AI Market Analysis (Ollama) ---")
     for idx, article in enumerate(new_articles):
         print(f"📊 Analyzing ({idx+1}/{len(new_articles)}): {article['original_title'][:60]}...")
@@ -125,18 +159,16 @@ def main():
                 "published_at": article['published_at'],
                 "category": rewritten.get("category", "MACRO")  # New: AI-assigned category
             }
+            final_article["symbols"] = extractor.extract_article(final_article)  # Tickers mentioned
+            journal.append(final_article)  # Survives a crash before the final save
             processed_news.append(final_article)
         else:
             print("⚠️  Skipping article due to AI failure.")
 
-    # Merge new with existing (new first for recency)
-    all_articles = processed_news + existing
-    
-    print(f"\n--- 3. Saving {len(all_articles)} total articles to database ---")
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(all_articles, f, indent=2, ensure_ascii=False)
+    print(f"\n--- 3. Saving {len(processed_news)} new articles to database ---")
+    all_articles, added = save_articles(processed_news, journal, extractor)
 
-    print(f"✅ Done! {len(processed_news)} new articles added. Total: {len(all_articles)}")
+    print(f"✅ Done! {len(added)} new articles added. Total: {len(all_articles)}")
 
 if __name__ == "__main__":
     main()
@@ -7,6 +7,7 @@ import os
 import sys
 from datetime import datetime
 import requests
+from storage import atomic_write_json
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
@@ -29,6 +30,17 @@ OUTPUT_FILE = os.path.join(DATA_DIR, "market_movers.json")
 CRYPTO_IDS = ["bitcoin", "ethereum", "solana"]  # CoinGecko IDs
 STOCK_SYMBOLS = ["NVDA", "TSLA", "AAPL", "MSFT"]  # Yahoo Finance symbols
 
+# Display tickers for CoinGecko IDs
+CRYPTO_SYMBOLS = {"bitcoin": "BTC", "ethereum": "ETH", "solana": "SOL"}
+
+# Company names (matched case-sensitively) used by entities.py to link news articles to stock tickers
+STOCK_NAMES = {
+    "NVDA": ["Nvidia", "NVIDIA"],
+    "TSLA": ["Tesla"],
+    "AAPL": ["Apple"],
+    "MSFT": ["Microsoft"],
+}
+
 def fetch_crypto_data():
     """Fetch crypto prices from CoinGecko (FREE, no API key)."""
     url = "https://api.coingecko.com/api/v3/simple/price"
@@ -44,13 +56,11 @@ def fetch_crypto_data():
         data = response.json()
         
         result = []
-        symbol_map = {"bitcoin": "BTC", "ethereum": "ETH", "solana": "SOL"}
-        
         for coin_id in CRYPTO_IDS:
             if coin_id in data:
                 coin_data = data[coin_id]
                 result.append({
-                    "symbol": symbol_map.get(coin_id, coin_id.upper()),
+                    "symbol": CRYPTO_SYMBOLS.get(coin_id, coin_id.upper()),
                     "price": coin_data.get("usd", 0),
                     "change_24h": round(coin_data.get("usd_24h_change", 0), 2)
                 })
@@ -108,12 +118,8 @@ def main():
         "stocks": stock_data
     }
     
-    # Ensure data directory exists
-    os.makedirs(DATA_DIR, exist_ok=True)
-    
-    # Save to JSON
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(market_data, f, indent=2, ensure_ascii=False)
+    # Save to JSON (atomically, so the server never reads a partial file)
+    atomic_write_json(OUTPUT_FILE, market_data)
     
     print(f"✅ Saved to {OUTPUT_FILE}")
     return market_data
@@ -1,12 +1,36 @@
-from flask import Flask, jsonify, send_file
+from flask import Flask, jsonify, request, send_file
 from flask_cors import CORS
 import subprocess
 import sys
 import os
+from entities import (EntityExtractor, build_symbol_index, load_symbol_index,
+                      INDEX_FILE, NEWS_FILE)
+from market_data import OUTPUT_FILE as MARKET_FILE
+from storage import read_json
 
 app = Flask(__name__)
 CORS(app)  # Allow dashboard.html to call this
 
+# (mtimes, articles by ID, symbol index); reloaded only when the files change
+_news_cache = (None, {}, {})
+
+def _mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def load_news_index():
+    """Return (articles by ID, symbol -> article IDs), cached until news.json
+    or symbol_index.json is rewritten."""
+    global _news_cache
+    key = (_mtime(NEWS_FILE), _mtime(INDEX_FILE))
+    if key != _news_cache[0]:
+        articles = read_json(NEWS_FILE, default=[])
+        index = load_symbol_index()
+        if index is None:
+            # Index not written yet (main.py has not run): build it once per reload
+            index = build_symbol_index(articles, EntityExtractor())
+        _news_cache = (key, {a.get('id'): a for a in articles}, index)
+    return _news_cache[1], _news_cache[2]
+
 @app.route('/dashboard.html')
 @app.route('/')
 def dashboard():
@@ -28,9 +52,7 @@ def generate():
         
         if result.returncode == 0:
             # Count articles in news.json
-            import json
-            with open('data/news.json', 'r', encoding='utf-8') as f:
-                articles = json.load(f)
+            articles = read_json(NEWS_FILE, default=[])
             
             return jsonify({
                 'success': True,
@@ -54,6 +76,37 @@ def generate():
             'error': str(e)
         }), 500
 
+@app.route('/news/<symbol>')
+def symbol_news(symbol):
+    """Serve news linked to a ticker alongside its latest quote."""
+    symbol = symbol.upper()
+    limit = max(1, min(request.args.get('limit', default=20, type=int), 100))
+
+    try:
+        by_id, index = load_news_index()
+        linked = [by_id[i] for i in index.get(symbol, []) if i in by_id]
+
+        quote = None
+        market = read_json(MARKET_FILE)
+        if market:
+            for entry in market.get('crypto', []) + market.get('stocks', []):
+                if entry.get('symbol') == symbol:
+                    quote = dict(entry, updated_at=market.get('updated_at'))
+                    break
+
+        return jsonify({
+            'success': True,
+            'symbol': symbol,
+            'quote': quote,
+            'count': len(linked),
+            'articles': linked[:limit]
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/upload', methods=['POST'])
 def upload():
     """Run the upload.py script to sync to Vercel."""
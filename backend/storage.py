@@ -0,0 +1,219 @@
+"""
+GlobalLens A1 - Crash-Safe Data Files
+Atomic JSON writes (temp file + fsync + rename), cross-process file locks and
+a small write-ahead journal of pending article commits.
+
+The scheduler, the Flask server and upload.py all touch data/*.json; every
+read and write of those files should go through this module so a reader never
+sees a half-written file.
+"""
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Fix Windows console encoding for emojis
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+# Read once at import: os.umask() can only be read by setting it, which would
+# briefly affect files created by other threads (e.g. the Flask server).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK  # Mode for newly created data files
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """Hold a lock on `path` across processes.
+
+    The lock lives in a sidecar `<path>.lock` file because atomic writes
+    replace the data file itself. Shared locks are only available on POSIX;
+    on Windows every lock is exclusive.
+    """
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+") as lock_file:
+        fd = lock_file.fileno()
+        if sys.platform == 'win32':
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)  # LK_LOCK gives up after ~10s; keep waiting
+        else:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == 'win32':
+                lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _fsync_dir(directory):
+    """Persist a rename by syncing its directory (no-op where unsupported)."""
+    if sys.platform == 'win32':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_mode(path):
+    """Mode for a new version of `path`: keep the current one, else follow the umask."""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return DEFAULT_FILE_MODE
+
+
+def _replace(src, dst, retries=50):
+    """os.replace, retrying while Windows reports the target as open elsewhere."""
+    for attempt in range(retries):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if sys.platform != 'win32' or attempt == retries - 1:
+                raise
+            time.sleep(0.1)
+
+
+def _atomic_write(path, write):
+    """Call write(f) on a temp file next to `path`, fsync it and rename it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix="." + os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(path))  # mkstemp creates files as 0600
+        _replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+def remove_stale_temp_files(directory):
+    """Delete `.<name>.*.tmp` files left in `directory` by a killed writer.
+
+    Each file is removed under its target's lock, so a temp file that a live
+    writer is still filling in is never touched.
+    """
+    for tmp_path in glob.glob(os.path.join(directory, ".*.tmp")):
+        # mkstemp names are ".<target>.<random>.tmp"
+        target = os.path.basename(tmp_path)[1:].rsplit(".", 2)[0]
+        with file_lock(os.path.join(directory, target)):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _write_json(path, data):
+    _atomic_write(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False))
+
+
+def atomic_write_json(path, data, lock=True):
+    """Write `data` as JSON so readers see either the old or the new file.
+
+    Pass lock=False when the caller already holds `file_lock(path)`.
+    """
+    if lock:
+        with file_lock(path):
+            _write_json(path, data)
+    else:
+        _write_json(path, data)
+
+
+def read_json(path, default=None, lock=True):
+    """Read a JSON file, returning `default` if it does not exist.
+
+    A file that exists but cannot be parsed raises ValueError instead of
+    returning `default`, so callers never mistake corruption for "no data"
+    and overwrite it. Pass lock=False when the caller already holds the lock.
+    """
+    if lock:
+        with file_lock(path, shared=True):
+            return read_json(path, default, lock=False)
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Journal:
+    def __init__(self, path):
+        """
+        Append-only JSON-lines journal. Each record is fsync'd before
+        `append` returns, so it survives a crash of the writing process.
+        """
+        self.path = path
+
+    def append(self, record):
+        """Durably append one record."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with file_lock(self.path):
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            if not self._ends_with_newline():
+                line = "\n" + line  # Terminate a torn line left by a crashed append
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _ends_with_newline(self):
+        """True if the journal is missing, empty or ends with a complete line."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # Torn last line from a crash mid-append
+        return records
+
+    def replay(self):
+        """Return all complete records still pending in the journal."""
+        with file_lock(self.path, shared=True):
+            return self._read()
+
+    def compact(self, keep):
+        """Drop committed records, keeping only those where keep(record) is true."""
+        with file_lock(self.path):
+            records = [r for r in self._read() if keep(r)]
+            if not records:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            _atomic_write(self.path, lambda f: f.writelines(
+                json.dumps(record, ensure_ascii=False) + "\n" for record in records
+            ))
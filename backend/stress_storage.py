@@ -0,0 +1,163 @@
+"""
+GlobalLens A1 - Storage Stress Test
+Runs concurrent main.py-style commits (main.save_articles + Journal) against
+unlocked readers, simulates crashes mid-run, recovers as main.py does on
+start-up and verifies nothing was lost.
+
+Usage: python stress_storage.py
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import entities
+import main
+from storage import (DEFAULT_FILE_MODE, Journal, file_lock, read_json,
+                     remove_stale_temp_files)
+
+# Fix Windows console encoding for emojis
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+
+def _use_data_dir(directory):
+    """Point main.py and entities.py at a scratch data directory."""
+    main.DATA_FILE = os.path.join(directory, "news.json")
+    entities.INDEX_FILE = os.path.join(directory, "symbol_index.json")
+
+
+def _stress_article(writer_id, seq):
+    return {
+        "id": f"{int(time.time())}-{writer_id}-{seq}",  # Timestamp-prefixed like main.py
+        "title": f"Nvidia stress article {writer_id}/{seq}",
+        "content": "x" * 512,
+        "original_url": f"stress://{writer_id}/{seq}",
+    }
+
+
+def _stress_writer(directory, journal_path, writer_id, rounds, crash_every):
+    """Commit articles the way main.py does, simulating a crash every `crash_every`."""
+    _use_data_dir(directory)
+    extractor = entities.EntityExtractor()
+    journal = Journal(journal_path)
+    for i in range(rounds):
+        article = _stress_article(writer_id, i)
+        article["symbols"] = extractor.extract_article(article)
+        journal.append(article)
+        if (i + 1) % crash_every == 0:
+            # Crash: a torn append is left behind and the article is never saved
+            with file_lock(journal_path):
+                with open(journal_path, "a", encoding="utf-8") as f:
+                    f.write('{"id": "torn')
+            continue
+        main.save_articles([article], journal, extractor)
+
+
+def _stress_reader(path, stop, errors):
+    reads = 0
+    # Unlocked reads rely on rename being atomic for open readers, which holds
+    # on POSIX only; on Windows readers take the shared lock instead.
+    lock = sys.platform == 'win32'
+    while not stop.is_set():
+        try:
+            items = read_json(path, default=[], lock=lock)
+            if not isinstance(items, list):
+                errors.put(f"unexpected payload {type(items).__name__}")
+            reads += 1
+        except Exception as e:
+            errors.put(repr(e))
+    return reads
+
+
+def _check_torn_append(tmp):
+    """A record appended after a torn line must survive replay."""
+    journal = Journal(os.path.join(tmp, "torn.journal"))
+    journal.append({"id": "a"})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"id": "b')
+    journal.append({"id": "c"})
+    ids = [r["id"] for r in journal.replay()]
+    return [] if ids == ["a", "c"] else [f"torn append lost records: replayed {ids}"]
+
+
+def _check_stale_temp_files(tmp):
+    """Temp files left by a killed writer are removed on start-up."""
+    stale = os.path.join(tmp, ".news.json.k1ll3d_x.tmp")
+    with open(stale, "w", encoding="utf-8") as f:
+        f.write("[")
+    remove_stale_temp_files(tmp)
+    return [f"stale temp file not removed: {stale}"] if os.path.exists(stale) else []
+
+
+def stress_test(writers=4, readers=4, rounds=50, crash_every=5):
+    """Run concurrent main.save_articles writers and readers, then recover and verify."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_data_dir(tmp)
+        path = main.DATA_FILE
+        journal_path = os.path.join(tmp, "news.journal")
+        ctx = multiprocessing.get_context("spawn")
+        stop = ctx.Event()
+        errors = ctx.Queue()
+
+        failures = _check_torn_append(tmp) + _check_stale_temp_files(tmp)
+
+        reader_procs = [ctx.Process(target=_stress_reader, args=(path, stop, errors))
+                        for _ in range(readers)]
+        writer_procs = [ctx.Process(target=_stress_writer,
+                                    args=(tmp, journal_path, w, rounds, crash_every))
+                        for w in range(writers)]
+
+        start = time.perf_counter()
+        for p in reader_procs + writer_procs:
+            p.start()
+        for p in writer_procs:
+            p.join()
+        stop.set()
+        for p in reader_procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        while not errors.empty():
+            failures.append(errors.get())
+        for p in writer_procs:
+            if p.exitcode != 0:
+                failures.append(f"writer exited with code {p.exitcode}")
+
+        # Every "crashed" commit must still be pending in the journal
+        crashed = writers * (rounds // crash_every)
+        journal = Journal(journal_path)
+        pending = journal.replay()
+        if len(pending) != crashed:
+            failures.append(f"lost journal records: {len(pending)}/{crashed} pending")
+
+        # Recover exactly as main.py does on start-up
+        saved_urls = {a.get("original_url") for a in main.load_existing_articles()}
+        main.save_articles([a for a in pending if a.get("original_url") not in saved_urls],
+                           journal)
+
+        items = read_json(path, default=[])
+        expected = writers * rounds
+        if len({a["original_url"] for a in items}) != expected or len(items) != expected:
+            failures.append(f"lost updates: {len(items)}/{expected} articles after recovery")
+        if journal.replay():
+            failures.append("journal not empty after recovery")
+        index = entities.load_symbol_index() or {}
+        if sorted(index.get("NVDA", [])) != sorted(a["id"] for a in items):
+            failures.append(f"symbol index out of sync: {len(index.get('NVDA', []))}/{len(items)}")
+        mode = os.stat(path).st_mode & 0o777
+        if sys.platform != 'win32' and mode != DEFAULT_FILE_MODE:
+            failures.append(f"news.json mode is {oct(mode)}, expected {oct(DEFAULT_FILE_MODE)}")
+
+    if failures:
+        print(f"❌ Stress test failed ({len(failures)} errors), first: {failures[0]}")
+        return False
+    print(f"✅ Stress test passed: {writers} writers x {rounds} commits "
+          f"({crashed} crashed and recovered), {readers} readers, {elapsed:.2f}s")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if stress_test() else 1)
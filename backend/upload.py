@@ -1,8 +1,8 @@
-import json
 import os
 import sys
 import requests
 from dotenv import load_dotenv
+from storage import read_json
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
@@ -31,9 +31,12 @@ def upload_to_vercel():
         print("   Run 'python main.py' first to generate news articles.")
         return False
     
-    # Read articles
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        articles = json.load(f)
+    # Read articles (shared lock: never sees a half-written news.json)
+    try:
+        articles = read_json(DATA_FILE, default=[])
+    except ValueError as e:
+        print(f"❌ Error: News data file is unreadable: {e}")
+        return False
     
     if not articles:
         print("⚠️  No articles found in news.json")